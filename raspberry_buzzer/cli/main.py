@@ -1,23 +1,114 @@
-import uuid
+import queue
+import time
 
-from rich.align import Align
 from rich.console import Console
 from rich.prompt import Confirm, IntPrompt, Prompt
-from rich.table import Table
 from rich.text import Text
 
-from raspberry_buzzer.src.buzzer_monitor import BuzzerMonitor
-from raspberry_buzzer.src.game_api import GameAPI
-from raspberry_buzzer.src.player_manager import PlayerManager
+from raspberry_buzzer.src import configure_logging, singletons
 
 console = Console()
 
+COMMANDS = ["add", "remove", "connect", "monitor", "mock", "help", "quit"]
+
+_ON_TEXT = Text("On", style="green")
+_OFF_TEXT = Text("Off", style="dim")
+_CONNECTED_TEXT = Text("Connected", style="green")
+_DISCONNECTED_TEXT = Text("Disconnected", style="red")
+_MONITORING_TEXT = Text("Monitoring", style="green")
+_STOPPED_TEXT = Text("Stopped", style="dim")
+_STATUS_SEPARATOR = Text(" • ")
+
+_MENU_TEXT = Text("Commands:\n" + "".join(f"  • {cmd}\n" for cmd in COMMANDS))
+
+_HELP_TEXT = Text.assemble(
+    ("Buzzer System CLI Help\n", "bold"),
+    "\n",
+    ("Getting Started:\n", "dim"),
+    "1. Add players with 'add'\n"
+    "2. Connect to game with 'connect'\n"
+    "3. Start monitoring with 'monitor'\n"
+    "\n",
+    ("Commands:\n", "dim"),
+    "add      - Add new player\n"
+    "remove   - Remove player\n"
+    "connect  - Connect to game server\n"
+    "monitor  - Start buzzer monitoring\n"
+    "mock     - Simulate buzzer press\n"
+    "help     - Show this help\n"
+    "quit     - Exit\n"
+    "\n",
+    ("Tips:\n", "dim"),
+    "- Players must be added before connecting\n"
+    "- Use Ctrl+C to stop monitoring\n"
+    "- GPIO pins must be unique",
+)
+
 
 class BuzzerCLI:
     def __init__(self):
-        self.player_manager = PlayerManager()
-        self.game_api = GameAPI()
-        self.buzzer_monitor = BuzzerMonitor(self.game_api, self.player_manager)
+        self.player_manager = singletons.player_manager()
+        self.game_api = singletons.game_api()
+        self.buzzer_monitor = singletons.buzzer_monitor()
+        self._players_cache = None
+        self._players_version = 0
+        self._player_id_list = []
+        self._pin_choice_strs = []
+        self._pin_choices_version = None
+        self._players_table = None
+        self._table_version = None
+        self._last_state = None
+        self._last_render = ""
+        self._handlers = {
+            "add": self.add_player,
+            "remove": self.remove_player,
+            "connect": self.connect_to_game,
+            "monitor": self.start_monitoring,
+            "mock": self.mock_buzzer_press,
+            "help": self.show_help,
+        }
+
+    def _players(self):
+        """Get all players, reusing the snapshot taken for the current render pass"""
+        if self._players_cache is None:
+            self._players_cache = dict(self.player_manager.get_all_players())
+            self._player_id_list = list(self._players_cache)
+        return self._players_cache
+
+    def _pin_choices(self):
+        """Get the available GPIO pins as prompt choices, rebuilt only when players changed"""
+        if self._pin_choices_version != self._players_version:
+            self._pin_choice_strs = [
+                str(p) for p in self.player_manager.get_available_gpio_pins()
+            ]
+            self._pin_choices_version = self._players_version
+        return self._pin_choice_strs
+
+    def _invalidate_players(self):
+        """Drop the cached players snapshot after a mutation"""
+        self._players_cache = None
+        self._players_version += 1
+
+    def _render_players_table(self):
+        """Get the players table, rebuilding its rows only when players changed"""
+        if self._table_version == self._players_version:
+            return self._players_table
+
+        from rich.table import Table
+
+        table = Table(show_header=True, header_style="dim")
+        table.add_column("ID", width=8, style="dim")
+        table.add_column("Name", width=15)
+        table.add_column("GPIO", width=5, justify="center")
+        table.add_column("Status", width=8)
+
+        for pid, config in self._players().items():
+            status = _ON_TEXT if config.enabled else _OFF_TEXT
+            table.add_row(pid[:8], config.name, str(config.gpio_pin), status)
+
+        self._players_table = table
+        self._table_version = self._players_version
+        return table
 
     def show_header(self):
         """Display the application header"""
@@ -26,71 +117,55 @@ class BuzzerCLI:
 
     def show_status_and_players(self):
         """Display system status and players in a compact view"""
-        players = self.player_manager.get_all_players()
-        enabled_players = sum(1 for p in players.values() if p.enabled)
+        state = (
+            self.game_api.connected,
+            self.buzzer_monitor.monitoring,
+            self._players_version,
+        )
+        if state != self._last_state:
+            with console.capture() as capture:
+                self._print_status_and_players()
+            self._last_render = capture.get()
+            self._last_state = state
+
+        console.file.write(self._last_render)
+
+    def _print_status_and_players(self):
+        """Print the status line and players table"""
+        players = self._players()
+        enabled_players = len(self.player_manager.get_enabled_players())
 
         # Status line
-        status_parts = []
-        if self.game_api.connected:
-            status_parts.append("[green]Connected[/green]")
-        else:
-            status_parts.append("[red]Disconnected[/red]")
-        
-        if self.buzzer_monitor.monitoring:
-            status_parts.append("[green]Monitoring[/green]")
-        else:
-            status_parts.append("[dim]Stopped[/dim]")
-        
-        status_parts.append(f"{enabled_players}/{len(players)} players")
-        
-        console.print(f"Status: {' • '.join(status_parts)}")
+        status_parts = [
+            _CONNECTED_TEXT if self.game_api.connected else _DISCONNECTED_TEXT,
+            _MONITORING_TEXT if self.buzzer_monitor.monitoring else _STOPPED_TEXT,
+            Text(f"{enabled_players}/{len(players)} players"),
+        ]
+
+        console.print(Text.assemble("Status: ", _STATUS_SEPARATOR.join(status_parts)))
 
         # Players table (only if players exist)
         if players:
             console.print()
-            table = Table(show_header=True, header_style="dim")
-            table.add_column("ID", width=8, style="dim")
-            table.add_column("Name", width=15)
-            table.add_column("GPIO", width=5, justify="center")
-            table.add_column("Status", width=8)
-
-            for pid, config in players.items():
-                status = "[green]On[/green]" if config.enabled else "[dim]Off[/dim]"
-                table.add_row(pid[:8], config.name, str(config.gpio_pin), status)
-
-            console.print(table)
+            console.print(self._render_players_table())
 
         console.print()
 
     def show_players(self):
         """Display all configured players - simplified version"""
-        players = self.player_manager.get_all_players()
+        players = self._players()
 
         if not players:
             console.print("[dim]No players configured[/dim]")
             console.print()
             return
 
-        table = Table(show_header=True, header_style="dim")
-        table.add_column("ID", width=8, style="dim")
-        table.add_column("Name", width=15)
-        table.add_column("GPIO", width=5, justify="center")
-        table.add_column("Status", width=8)
-
-        for pid, config in players.items():
-            status = "[green]On[/green]" if config.enabled else "[dim]Off[/dim]"
-            table.add_row(pid[:8], config.name, str(config.gpio_pin), status)
-
-        console.print(table)
+        console.print(self._render_players_table())
         console.print()
 
     def show_menu(self):
         """Display the main menu options"""
-        commands = ["add", "remove", "connect", "monitor", "mock", "help", "quit"]
-        console.print("Commands:")
-        for cmd in commands:
-            console.print(f"  • {cmd}")
-        console.print()
+        console.print(_MENU_TEXT)
 
     def add_player(self):
         """Add a new player with Rich prompts"""
@@ -101,28 +176,29 @@ class BuzzerCLI:
             console.print("[red]Invalid name[/red]")
             return
 
-        pins = self.player_manager.get_available_gpio_pins()
+        pins = self._pin_choices()
         if not pins:
             console.print("[red]No GPIO pins available[/red]")
             return
 
-        console.print(f"Available pins: {', '.join(map(str, pins))}")
+        console.print(f"Available pins: {', '.join(pins)}")
 
         try:
-            pin = IntPrompt.ask("GPIO pin", choices=[str(p) for p in pins], show_choices=False)
+            pin = IntPrompt.ask("GPIO pin", choices=pins, show_choices=False)
         except KeyboardInterrupt:
             console.print("[yellow]Cancelled[/yellow]")
             return
 
-        pid = str(uuid.uuid4())[:8]
+        pid = self.player_manager.new_id()
         if self.player_manager.add_player(pid, name.strip(), pin):
+            self._invalidate_players()
             console.print(f"[green]Added {name} on pin {pin}[/green]")
         else:
             console.print("[red]Failed to add player[/red]")
 
     def remove_player(self):
         """Remove a player with confirmation"""
-        players = self.player_manager.get_all_players()
+        players = self._players()
         if not players:
             console.print("[yellow]No players to remove[/yellow]")
             return
@@ -130,14 +206,13 @@ class BuzzerCLI:
         console.print("[bold]Remove Player[/bold]")
         self.show_players()
 
-        player_ids = list(players.keys())
-
         try:
-            pid = Prompt.ask("Player ID", choices=player_ids, show_choices=False)
+            pid = Prompt.ask("Player ID", choices=self._player_id_list, show_choices=False)
             player_name = players[pid].name
             
             if Confirm.ask(f"Remove {player_name}?"):
                 if self.player_manager.remove_player(pid):
+                    self._invalidate_players()
                     console.print(f"[green]Removed {player_name}[/green]")
                 else:
                     console.print("[red]Failed to remove player[/red]")
@@ -151,7 +226,7 @@ class BuzzerCLI:
         """Connect to server and join game"""
         console.print("[bold]Connect to Game[/bold]")
 
-        players = self.player_manager.get_all_players()
+        players = self._players()
         if not players:
             console.print("[red]No players configured[/red]")
             return
@@ -174,18 +249,18 @@ class BuzzerCLI:
 
         console.print("[green]Connected[/green] - registering players...")
         
-        success_count = 0
-        for pid, config in players.items():
-            if not config.enabled:
-                continue
+        enabled = self.player_manager.get_enabled_players()
+        results = self.game_api.connect_all(
+            code.strip(), {pid: config.name for pid, config in enabled.items()}
+        )
 
-            result = self.game_api.join_game(code.strip(), config.name)
-            if result:
-                self.game_api.register_player_mapping(pid, result["playerId"])
+        success_count = 0
+        for pid, api_player_id in results.items():
+            if api_player_id:
                 success_count += 1
-                console.print(f"  [green]✓[/green] {config.name}")
+                console.print(f"  [green]✓[/green] {enabled[pid].name}")
             else:
-                console.print(f"  [red]✗[/red] {config.name}")
+                console.print(f"  [red]✗[/red] {enabled[pid].name}")
 
         if success_count > 0:
             self.buzzer_monitor.start_monitoring()
@@ -200,19 +275,39 @@ class BuzzerCLI:
             return
 
         console.print("[green]Monitoring active[/green] - Press Ctrl+C to stop")
+        self._drain_press_events()
         self.buzzer_monitor.start_monitoring()
 
         try:
             with console.status("Waiting for buzzer presses...", spinner="dots"):
                 while True:
-                    pass
+                    try:
+                        event = self.buzzer_monitor.event_queue.get(timeout=0.25)
+                    except queue.Empty:
+                        continue
+                    console.print(self._press_line(event))
         except KeyboardInterrupt:
             self.buzzer_monitor.stop_monitoring()
             console.print("\n[yellow]Monitoring stopped[/yellow]")
 
+    def _drain_press_events(self):
+        """Discard presses queued while nobody was watching"""
+        try:
+            while True:
+                self.buzzer_monitor.event_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _press_line(self, event):
+        """Format a buzzer press event for the monitoring view"""
+        stamp = time.strftime("%H:%M:%S", time.localtime(event.timestamp))
+        line = Text.assemble((stamp, "dim"), " ", (event.player_name, "bold"))
+        line.append(" buzzed" if event.sent else " pressed (not sent)")
+        return line
+
     def mock_buzzer_press(self):
         """Simulate a buzzer press for testing"""
-        players = self.player_manager.get_all_players()
+        players = self._players()
         if not players:
             console.print("[yellow]No players configured[/yellow]")
             return
@@ -220,10 +315,8 @@ class BuzzerCLI:
         console.print("[bold]Mock Buzzer Press[/bold]")
         self.show_players()
 
-        player_ids = list(players.keys())
-
         try:
-            pid = Prompt.ask("Player ID", choices=player_ids, show_choices=False)
+            pid = Prompt.ask("Player ID", choices=self._player_id_list, show_choices=False)
             player_name = players[pid].name
             
             console.print(f"Simulating press for {player_name}...")
@@ -235,26 +328,7 @@ class BuzzerCLI:
 
     def show_help(self):
         """Display detailed help information"""
-        console.print("[bold]Buzzer System CLI Help[/bold]")
-        console.print()
-        console.print("[dim]Getting Started:[/dim]")
-        console.print("1. Add players with 'add'")
-        console.print("2. Connect to game with 'connect'")
-        console.print("3. Start monitoring with 'monitor'")
-        console.print()
-        console.print("[dim]Commands:[/dim]")
-        console.print("add      - Add new player")
-        console.print("remove   - Remove player")
-        console.print("connect  - Connect to game server")
-        console.print("monitor  - Start buzzer monitoring")
-        console.print("mock     - Simulate buzzer press")
-        console.print("help     - Show this help")
-        console.print("quit     - Exit")
-        console.print()
-        console.print("[dim]Tips:[/dim]")
-        console.print("- Players must be added before connecting")
-        console.print("- Use Ctrl+C to stop monitoring")
-        console.print("- GPIO pins must be unique")
+        console.print(_HELP_TEXT)
 
     def run(self):
         """Main application loop"""
@@ -262,39 +336,31 @@ class BuzzerCLI:
         self.show_header()
 
         while True:
+            self._players_cache = None
             try:
                 self.show_status_and_players()
                 self.show_menu()
 
                 cmd = Prompt.ask(
                     "Command",
-                    choices=["add", "remove", "connect", "monitor", "mock", "help", "quit"],
+                    choices=COMMANDS,
                     show_choices=False,
                 ).lower()
 
                 console.print()
 
-                if cmd == "add":
-                    self.add_player()
-                elif cmd == "remove":
-                    self.remove_player()
-                elif cmd == "connect":
-                    self.connect_to_game()
-                elif cmd == "monitor":
-                    self.start_monitoring()
-                elif cmd == "mock":
-                    self.mock_buzzer_press()
-                elif cmd == "help":
-                    self.show_help()
-                elif cmd == "quit":
+                if cmd == "quit":
                     console.print("[blue]Goodbye![/blue]")
                     break
 
-                if cmd != "quit":
-                    console.print()
-                    Prompt.ask("[dim]Press Enter to continue[/dim]")
-                    console.clear()
-                    self.show_header()
+                handler = self._handlers.get(cmd)
+                if handler:
+                    handler()
+
+                console.print()
+                Prompt.ask("[dim]Press Enter to continue[/dim]")
+                console.clear()
+                self.show_header()
 
             except KeyboardInterrupt:
                 console.print("\n[blue]Goodbye![/blue]")
@@ -305,6 +371,7 @@ class BuzzerCLI:
 
 
 def main():
+    configure_logging()
     app = BuzzerCLI()
     app.run()
 
@@ -1,20 +1,21 @@
 # pyright: basic
 
-import uuid
+import functools
+import logging
 
 import streamlit as st
 
-from raspberry_buzzer.src.buzzer_monitor import BuzzerMonitor
-from raspberry_buzzer.src.game_api import GameAPI
-from raspberry_buzzer.src.gpio_handler import gpio_handler
-from raspberry_buzzer.src.player_manager import PlayerManager
+from raspberry_buzzer.src import configure_logging, singletons
+from raspberry_buzzer.src.gpio_handler import get_gpio_handler
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 # Page configuration
 st.set_page_config(page_title="Buzzer Configuration")
 
 # Clean, flat design CSS
-st.markdown(
-    """
+CSS = """
 <style>
     /* Reset and base styles */
     .main-content {
@@ -134,30 +135,6 @@ st.markdown(
         background: #1d4ed8 !important;
     }
 
-    .btn-secondary > button {
-        background: #6b7280 !important;
-    }
-
-    .btn-secondary > button:hover {
-        background: #4b5563 !important;
-    }
-
-    .btn-danger > button {
-        background: #dc2626 !important;
-    }
-
-    .btn-danger > button:hover {
-        background: #b91c1c !important;
-    }
-
-    .btn-success > button {
-        background: #059669 !important;
-    }
-
-    .btn-success > button:hover {
-        background: #047857 !important;
-    }
-
     /* Player list */
     .player-item {
         background: #f8fafc;
@@ -201,23 +178,6 @@ st.markdown(
         font-size: 1rem;
     }
 
-    .buzzer-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fill, minmax(150px, 1fr));
-        gap: 0.75rem;
-        margin-top: 0.75rem;
-    }
-
-    /* Control bar */
-    .control-bar {
-        display: flex;
-        gap: 0.75rem;
-        flex-wrap: wrap;
-        margin-top: 2rem;
-        padding-top: 1.5rem;
-        border-top: 1px solid #e2e8f0;
-    }
-
     /* Hide Streamlit elements */
     .stDeployButton {
         display: none;
@@ -231,70 +191,126 @@ st.markdown(
         margin - top: -80px;
     }
 </style>
-""",
-    unsafe_allow_html=True,
-)
-
-# Initialize session state
-if "player_manager" not in st.session_state:
-    st.session_state.player_manager = PlayerManager()
-if "game_api" not in st.session_state:
-    st.session_state.game_api = GameAPI()
-if "buzzer_monitor" not in st.session_state:
-    st.session_state.buzzer_monitor = BuzzerMonitor(
-        st.session_state.game_api, st.session_state.player_manager
-    )
+"""
 
-# Header
-st.markdown(
-    """
+HEADER_HTML = """
 <div class="header">
     <h1>Buzzer Configuration</h1>
 </div>
-""",
-    unsafe_allow_html=True,
-)
-
-# Status Overview with simple dots
-players = st.session_state.player_manager.get_all_players()
-server_connected = st.session_state.game_api.connected
-game_connected = bool(st.session_state.game_api.game_id)
-monitoring = st.session_state.buzzer_monitor.monitoring
-buzzers_available = st.session_state.game_api.buzzers_available
-buzzer_status = st.session_state.game_api.get_buzzer_status()
-
-# Clean status without emojis
-server_dot = "green" if server_connected else "red"
-game_dot = "green" if game_connected else "red"
-monitor_dot = "green" if monitoring else "red"
-buzzer_dot = "green" if buzzers_available else ("orange" if game_connected else "red")
-
-st.markdown(
-    f"""
+"""
+
+STATUS_TPL = """
 <div class="status-bar">
     <div class="status-item">
         <div class="status-dot {server_dot}"></div>
-        <span>Server: {"Connected" if server_connected else "Disconnected"}</span>
+        <span>Server: {server_text}</span>
     </div>
     <div class="status-item">
         <div class="status-dot {game_dot}"></div>
-        <span>Game: {"Connected" if game_connected else "Not Connected"}</span>
+        <span>Game: {game_text}</span>
     </div>
     <div class="status-item">
         <div class="status-dot {monitor_dot}"></div>
-        <span>Monitoring: {"Active" if monitoring else "Stopped"}</span>
+        <span>Monitoring: {monitor_text}</span>
     </div>
     <div class="status-item">
         <div class="status-dot {buzzer_dot}"></div>
         <span>Buzzers: {buzzer_status}</span>
     </div>
     <div class="status-item">
-        <span>Players: {len(players)} configured</span>
+        <span>Players: {player_count} configured</span>
     </div>
 </div>
-""",
-    unsafe_allow_html=True,
-)
+"""
+
+
+@functools.lru_cache(maxsize=64)
+def render_status(
+    server_dot: str,
+    server_text: str,
+    game_dot: str,
+    game_text: str,
+    monitor_dot: str,
+    monitor_text: str,
+    buzzer_dot: str,
+    buzzer_status: str,
+    player_count: int,
+) -> str:
+    """Render the status bar HTML, memoized on the small set of status values"""
+    return STATUS_TPL.format(
+        server_dot=server_dot,
+        server_text=server_text,
+        game_dot=game_dot,
+        game_text=game_text,
+        monitor_dot=monitor_dot,
+        monitor_text=monitor_text,
+        buzzer_dot=buzzer_dot,
+        buzzer_status=buzzer_status,
+        player_count=player_count,
+    )
+
+
+st.markdown(CSS, unsafe_allow_html=True)
+
+
+# Process-wide singletons shared by every session and rerun
+player_manager = singletons.player_manager()
+game_api = singletons.game_api()
+buzzer_monitor = singletons.buzzer_monitor()
+
+# Header
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
+
+# Snapshot once per rerun so the page renders one consistent set of players
+players = dict(player_manager.get_all_players())
+player_list = list(players.items())
+server_connected = game_api.connected
+game_connected = bool(game_api.game_id)
+monitoring = buzzer_monitor.monitoring
+
+
+# Status Overview with simple dots, refreshed on its own without rerunning the page
+@st.fragment
+def status_bar(page_state):
+    players = player_manager.get_all_players()
+    server_connected = game_api.connected
+    game_connected = bool(game_api.game_id)
+    monitoring = buzzer_monitor.monitoring
+
+    # The rest of the page renders from page_state, rerun it all once that is stale
+    if (server_connected, game_connected, monitoring, players) != page_state:
+        st.rerun(scope="app")
+
+    buzzers_available = game_api.buzzers_available
+    buzzer_status = game_api.get_buzzer_status()
+
+    # Clean status without emojis
+    server_dot = "green" if server_connected else "red"
+    game_dot = "green" if game_connected else "red"
+    monitor_dot = "green" if monitoring else "red"
+    buzzer_dot = (
+        "green" if buzzers_available else ("orange" if game_connected else "red")
+    )
+
+    st.markdown(
+        render_status(
+            server_dot,
+            "Connected" if server_connected else "Disconnected",
+            game_dot,
+            "Connected" if game_connected else "Not Connected",
+            monitor_dot,
+            "Active" if monitoring else "Stopped",
+            buzzer_dot,
+            buzzer_status,
+            len(players),
+        ),
+        unsafe_allow_html=True,
+    )
+
+    st.button("Refresh Status")
+
+
+status_bar((server_connected, game_connected, monitoring, players))
 
 # Game Connection Section (First Priority)
 st.divider()
@@ -308,43 +324,40 @@ with st.form("game_connection"):
 
     if connect_submitted and server_url and game_code and len(players) > 0:
         # Connect to server
-        st.session_state.game_api.server_url = server_url
-        print(f"Starting connection process with {len(players)} players")
+        game_api.server_url = server_url
+        logger.debug("Starting connection process with %d players", len(players))
 
-        if st.session_state.game_api.connect_to_server():
-            print("Main connection successful, registering players...")
+        if game_api.connect_to_server():
+            logger.debug("Main connection successful, registering players...")
             # Register all players
+            results = game_api.connect_all(
+                game_code,
+                {player_id: config.name for player_id, config in player_list},
+            )
+
             success_count = 0
-            for player_id, config in players.items():
-                print(f"Registering player {config.name} (local ID: {player_id})")
-                result = st.session_state.game_api.join_game(game_code, config.name)
-                if result:
-                    print(
-                        f"API registration successful for {config.name}, creating socket connection..."
-                    )
-                    st.session_state.game_api.register_player_mapping(
-                        player_id, result["playerId"]
-                    )
+            for player_id, api_player_id in results.items():
+                config = players[player_id]
+                if api_player_id:
+                    logger.debug("API registration successful for %s", config.name)
                     success_count += 1
                 else:
-                    print(f"API registration failed for {config.name}")
+                    logger.warning("API registration failed for %s", config.name)
                     st.error(f"Failed to register {config.name}")
 
             if success_count > 0:
-                print("Starting buzzer monitoring...")
-                st.session_state.buzzer_monitor.start_monitoring()
+                logger.debug("Starting buzzer monitoring...")
+                buzzer_monitor.start_monitoring()
                 st.success(f"Connected {success_count} players successfully")
             else:
                 st.error("Failed to register any players")
         else:
-            print("Main connection failed")
+            logger.warning("Main connection failed")
             st.error("Failed to connect to server")
 
 if len(players) == 0:
     st.info("Add players below to enable connection")
 
-st.markdown("</div>", unsafe_allow_html=True)
-
 st.divider()
 st.markdown("<h3>Players</h3>", unsafe_allow_html=True)
 
@@ -354,7 +367,7 @@ with st.form("add_player"):
     with col1:
         player_name = st.text_input("Player Name", placeholder="Enter name")
     with col2:
-        available_pins = st.session_state.player_manager.get_available_gpio_pins()
+        available_pins = player_manager.get_available_gpio_pins()
         if available_pins:
             gpio_pin = st.selectbox("GPIO Pin", available_pins)
         else:
@@ -364,8 +377,8 @@ with st.form("add_player"):
     submitted = st.form_submit_button("Add Player")
 
     if submitted and player_name and gpio_pin:
-        player_id = str(uuid.uuid4())[:8]
-        if st.session_state.player_manager.add_player(player_id, player_name, gpio_pin):
+        player_id = player_manager.new_id()
+        if player_manager.add_player(player_id, player_name, gpio_pin):
             st.success(f"Added {player_name}")
             st.rerun()
         else:
@@ -373,7 +386,7 @@ with st.form("add_player"):
 
 # Current players list
 if players:
-    for player_id, config in players.items():
+    for player_id, config in player_list:
         st.markdown(
             f"""
         <div class="player-item">
@@ -386,15 +399,13 @@ if players:
             unsafe_allow_html=True,
         )
         if st.button("Remove", key=f"remove_{player_id}", help=f"Remove {config.name}"):
-            st.session_state.player_manager.remove_player(player_id)
+            player_manager.remove_player(player_id)
             st.rerun()
 else:
     st.info("No players configured yet")
 
-st.markdown("</div>", unsafe_allow_html=True)
-
 # Development Controls (if in mock mode)
-if gpio_handler.mock_mode and len(players) > 0:
+if get_gpio_handler().mock_mode and len(players) > 0:
     st.markdown(
         """
     <div class="dev-controls">
@@ -405,80 +416,46 @@ if gpio_handler.mock_mode and len(players) > 0:
         unsafe_allow_html=True,
     )
 
-    st.markdown('<div class="buzzer-grid">', unsafe_allow_html=True)
-
-    # Create buzzer test buttons in a grid
-    cols = st.columns(min(len(players), 4))
-    for idx, (player_id, config) in enumerate(players.items()):
-        with cols[idx % 4]:
-            button_key = f"test_buzzer_{player_id}_{config.gpio_pin}"
-            if st.button(
-                f"Test {config.name}",
-                key=button_key,
-                help=f"Test buzzer for {config.name}",
-            ):
-                st.session_state.buzzer_monitor.mock_buzzer_press(player_id)
-                st.success(f"Buzzer pressed: {config.name}")
-                st.rerun()
-
-    st.markdown("</div>", unsafe_allow_html=True)
+    # Test clicks only rerun the grid, not the whole page
+    @st.fragment
+    def buzzer_grid(player_list):
+        # Create buzzer test buttons in a grid
+        cols = st.columns(min(len(player_list), 4))
+        for idx, (player_id, config) in enumerate(player_list):
+            with cols[idx % 4]:
+                button_key = f"test_buzzer_{player_id}_{config.gpio_pin}"
+                if st.button(
+                    f"Test {config.name}",
+                    key=button_key,
+                    help=f"Test buzzer for {config.name}",
+                ):
+                    buzzer_monitor.mock_buzzer_press(player_id)
+                    st.success(f"Buzzer pressed: {config.name}")
+
+    buzzer_grid(player_list)
 
 # Control buttons
 if len(players) > 0:
-    st.markdown('<div class="control-bar">', unsafe_allow_html=True)
-
-    col1, col2, col3, col4 = st.columns(4)
+    col1, col2, col3 = st.columns(3)
 
     with col1:
-        if st.button("Refresh Status"):
-            st.rerun()
-
-    with col2:
         if monitoring:
-            st.markdown('<div class="btn-secondary">', unsafe_allow_html=True)
             if st.button("Stop Monitoring"):
-                st.session_state.buzzer_monitor.stop_monitoring()
+                buzzer_monitor.stop_monitoring()
                 st.rerun()
-            st.markdown("</div>", unsafe_allow_html=True)
 
-    with col3:
+    with col2:
         if server_connected:
-            st.markdown('<div class="btn-secondary">', unsafe_allow_html=True)
             if st.button("Disconnect"):
-                st.session_state.game_api.disconnect_from_server()
-                st.session_state.buzzer_monitor.stop_monitoring()
+                game_api.disconnect_from_server()
+                buzzer_monitor.stop_monitoring()
                 st.rerun()
-            st.markdown("</div>", unsafe_allow_html=True)
 
-    with col4:
+    with col3:
         if server_connected and game_connected:
-            st.markdown('<div class="btn-success">', unsafe_allow_html=True)
             if st.button("Clear Buzzers"):
-                # Send clear buzzer command to server using any connected player
-                connections = list(
-                    st.session_state.game_api.player_connections.values()
-                )
-                if connections:
-                    try:
-                        # Use the first available connection to send the clear command
-                        connections[0].sio.emit(
-                            "game_action", {"type": "clear_buzzers", "data": {}}
-                        )
-                        st.success("Buzzers cleared")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Failed to clear buzzers: {e}")
+                if game_api.clear_buzzers():
+                    st.success("Buzzers cleared")
+                    st.rerun()
                 else:
-                    st.error("No player connections available")
-            st.markdown("</div>", unsafe_allow_html=True)
-
-    st.markdown("</div>", unsafe_allow_html=True)
-
-
-def main():
-    """Entry point for the GUI application"""
-    pass  # Streamlit app runs automatically when the module is executed
-
-
-if __name__ == "__main__":
-    main()
+                    st.error("Failed to clear buzzers")
@@ -0,0 +1,10 @@
+import logging
+import os
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def configure_logging() -> None:
+    """Configure root logging from $LOGLEVEL, falling back to WARNING if unknown"""
+    level = logging.getLevelName(os.environ.get("LOGLEVEL", "WARNING").upper())
+    logging.basicConfig(level=level if isinstance(level, int) else logging.WARNING)
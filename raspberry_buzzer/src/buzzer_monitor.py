@@ -1,23 +1,41 @@
+import logging
+import queue
 import time
+from typing import NamedTuple
 
 from .game_api import GameAPI
-from .gpio_handler import gpio_handler
-from .player_manager import PlayerManager
+from .gpio_handler import GPIOHandler, get_gpio_handler
+from .player_manager import PlayerConfig, PlayerManager
+
+logger = logging.getLogger(__name__)
+
+
+class PressEvent(NamedTuple):
+    player_id: str
+    player_name: str
+    timestamp: float
+    sent: bool
 
 
 class BuzzerMonitor:
     game_api: GameAPI
     player_manager: PlayerManager
+    gpio_handler: GPIOHandler
     monitoring: bool
     last_buzzer_times: dict[str, float]
     pin_to_player_map: dict[int, str]
+    player_id_to_name: dict[str, str]
+    event_queue: "queue.Queue[PressEvent]"
 
     def __init__(self, game_api: GameAPI, player_manager: PlayerManager):
         self.game_api = game_api
         self.player_manager = player_manager
+        self.gpio_handler = get_gpio_handler()
         self.monitoring = False
         self.last_buzzer_times = {}
         self.pin_to_player_map = {}
+        self.player_id_to_name = {}
+        self.event_queue = queue.Queue(maxsize=100)
 
     def start_monitoring(self):
         """Start monitoring buzzers"""
@@ -28,64 +46,104 @@ class BuzzerMonitor:
         players = self.player_manager.get_enabled_players()
 
         self.pin_to_player_map = {}
+        self.player_id_to_name = {}
 
         for player_id, config in players.items():
             self.pin_to_player_map[config.gpio_pin] = player_id
+            self.player_id_to_name[player_id] = config.name
+            self.gpio_handler.setup_button(config.gpio_pin, self._on_pin_triggered)
+            logger.debug(
+                "Monitoring %s on GPIO %s -> Player ID %s",
+                config.name,
+                config.gpio_pin,
+                player_id,
+            )
+
+    def add_player(self, player_id: str, config: PlayerConfig):
+        """Start watching a single player's button while monitoring"""
+        if not self.monitoring or not config.enabled:
+            return
 
-            def create_pin_callback(pin_number):
-                def pin_callback(triggered_pin):
-                    mapped_player_id = self.pin_to_player_map.get(triggered_pin)
-                    if mapped_player_id:
-                        self._handle_buzzer(mapped_player_id)
-                    else:
-                        print(f"Warning: No player mapped to GPIO pin {triggered_pin}")
+        self.pin_to_player_map[config.gpio_pin] = player_id
+        self.player_id_to_name[player_id] = config.name
+        self.gpio_handler.setup_button(config.gpio_pin, self._on_pin_triggered)
+        logger.debug(
+            "Monitoring %s on GPIO %s -> Player ID %s",
+            config.name,
+            config.gpio_pin,
+            player_id,
+        )
+
+    def remove_player(self, player_id: str):
+        """Stop watching a single player's button while monitoring"""
+        pin = next(
+            (pin for pin, pid in self.pin_to_player_map.items() if pid == player_id),
+            None,
+        )
+        if pin is None:
+            return
 
-                return pin_callback
+        del self.pin_to_player_map[pin]
+        self.player_id_to_name.pop(player_id, None)
+        self.gpio_handler.teardown_button(pin)
+        logger.debug("Stopped monitoring GPIO %s for player ID %s", pin, player_id)
 
-            callback = create_pin_callback(config.gpio_pin)
-            gpio_handler.setup_button(config.gpio_pin, callback)
-            print(
-                f"Monitoring {config.name} on GPIO {config.gpio_pin} -> Player ID {player_id}"
-            )
+    def sync_player(self, player_id: str, config: PlayerConfig | None):
+        """Apply a single player change, config is None when the player was removed"""
+        self.remove_player(player_id)
+        if config is not None:
+            self.add_player(player_id, config)
 
     def stop_monitoring(self):
         """Stop monitoring buzzers"""
         self.monitoring = False
         self.pin_to_player_map = {}
-        gpio_handler.cleanup()
-        print("Stopped monitoring")
+        self.player_id_to_name = {}
+        self.gpio_handler.cleanup()
+        logger.debug("Stopped monitoring")
+
+    def _on_pin_triggered(self, triggered_pin: int):
+        """Route a GPIO edge to the player mapped on that pin"""
+        mapped_player_id = self.pin_to_player_map.get(triggered_pin)
+        if mapped_player_id:
+            self._handle_buzzer(mapped_player_id)
+        else:
+            logger.warning("No player mapped to GPIO pin %s", triggered_pin)
 
     def _handle_buzzer(self, player_id: str):
         """Handle buzzer press"""
-        now = time.time()
+        now = time.monotonic()
 
-        if player_id in self.last_buzzer_times and now - self.last_buzzer_times[player_id] < 0.5:
+        last_press = self.last_buzzer_times.get(player_id)
+        if last_press is not None and now - last_press < 0.5:
             return
 
         self.last_buzzer_times[player_id] = now
 
-        players = self.player_manager.get_all_players()
-        player_config = players.get(player_id)
-        player_name = player_config.name if player_config else "Unknown"
+        player_name = self.player_id_to_name.get(player_id, "Unknown")
 
+        success = False
         if self.game_api.connected:
             success = self.game_api.press_buzzer(player_id)
             if success:
-                print(f"[BUZZER] Pressed: {player_name} (ID: {player_id})")
-            else:
-                pass
+                logger.info("Buzzer pressed: %s (ID: %s)", player_name, player_id)
         else:
-            print(f"[BUZZER] Pressed by {player_name} but not connected to game")
+            logger.info("Buzzer pressed by %s but not connected to game", player_name)
+
+        try:
+            self.event_queue.put_nowait(PressEvent(player_id, player_name, time.time(), success))
+        except queue.Full:
+            pass
 
     def mock_buzzer_press(self, player_id: str):
         """Test buzzer press for a specific player"""
-        print(f"Mock buzzer press for player ID: {player_id}")
+        logger.debug("Mock buzzer press for player ID: %s", player_id)
 
         players = self.player_manager.get_all_players()
         player_config = players.get(player_id)
 
         if not player_config:
-            print(f"Error: Player {player_id} not found")
+            logger.error("Player %s not found", player_id)
             return
 
-        gpio_handler.mock_button_press(player_config.gpio_pin)
+        self.gpio_handler.mock_button_press(player_config.gpio_pin)
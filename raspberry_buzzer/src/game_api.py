@@ -1,9 +1,17 @@
+import logging
 import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import requests
 import socketio
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# How long a fetched game info payload is reused before hitting the server again
+GAME_INFO_TTL = 5.0
 
 
 class PlayerConnection:
@@ -22,13 +30,15 @@ class PlayerConnection:
         @self.sio.event
         def connect():
             self.connected = True
-            print(f"✅ Player {self.player_id} connected to server")
+            logger.debug("Player %s connected to server", self.player_id)
             try:
                 self.sio.emit(
                     "join_game", {"gameId": self.game_id, "playerId": self.player_id}
                 )
             except Exception as e:
-                print(f"Failed to join game room for player {self.player_id}: {e}")
+                logger.error(
+                    "Failed to join game room for player %s: %s", self.player_id, e
+                )
 
         @self.sio.event
         def disconnect():
@@ -40,66 +50,32 @@ class PlayerConnection:
 
         @self.sio.event
         def game_update(data):
-            """Handle game state updates including all state changes"""
-            try:
-                if "data" in data and "game" in data["data"]:
-                    game_data = data["data"]["game"]
-
-                    old_locked = self.game_api.buzzers_locked
-                    old_active = self.game_api.is_active
-                    old_countdown = self.game_api.countdown_active
-
-                    self.game_api.buzzers_locked = game_data.get("buzzersLocked", False)
-                    self.game_api.is_active = game_data.get("isActive", False)
-                    self.game_api.countdown_active = game_data.get(
-                        "countdownActive", False
-                    )
-
-                    if old_locked != self.game_api.buzzers_locked:
-                        status = (
-                            "LOCKED" if self.game_api.buzzers_locked else "UNLOCKED"
-                        )
-                        print(f"[GAME] Buzzers are now {status}")
-
-                    if old_active != self.game_api.is_active:
-                        status = "ACTIVE" if self.game_api.is_active else "INACTIVE"
-                        print(f"[GAME] Game is now {status}")
-
-                    if old_countdown != self.game_api.countdown_active:
-                        status = (
-                            "COUNTDOWN"
-                            if self.game_api.countdown_active
-                            else "NO COUNTDOWN"
-                        )
-                        print(f"[GAME] Countdown state: {status}")
-
-                    if self.game_api.game_update_callback:
-                        self.game_api.game_update_callback(data)
-            except Exception as e:
-                print(f"Error processing game update: {e}")
+            self.game_api.handle_game_update(data)
 
     def connect_to_server(self) -> bool:
-        """Connect this player to the server"""
+        """Connect this player to the server, returning False on retryable failures"""
         try:
-            print(f"Connecting player {self.player_id} to {self.server_url}")
+            logger.debug("Connecting player %s to %s", self.player_id, self.server_url)
             self.sio.connect(self.server_url, wait_timeout=5)
             return True
-        except Exception as e:
-            print(f"Failed to connect player {self.player_id}: {e}")
+        except socketio.exceptions.ConnectionError as e:
+            logger.warning("Failed to connect player %s: %s", self.player_id, e)
             return False
 
     def press_buzzer(self) -> bool:
         """Press buzzer for this specific player"""
         if not self.connected:
-            print(f"Cannot press buzzer: player {self.player_id} not connected")
+            logger.warning(
+                "Cannot press buzzer: player %s not connected", self.player_id
+            )
             return False
 
         try:
             self.sio.emit("press_buzzer")
-            print(f"Buzzer pressed for player {self.player_id}")
+            logger.debug("Buzzer pressed for player %s", self.player_id)
             return True
         except Exception as e:
-            print(f"Error pressing buzzer for player {self.player_id}: {e}")
+            logger.error("Error pressing buzzer for player %s: %s", self.player_id, e)
             return False
 
     def disconnect_from_server(self):
@@ -107,9 +83,9 @@ class PlayerConnection:
         if self.connected:
             try:
                 self.sio.disconnect()
-                print(f"✅ Player {self.player_id} disconnected cleanly")
+                logger.debug("Player %s disconnected cleanly", self.player_id)
             except Exception as e:
-                print(f"❌ Error disconnecting player {self.player_id}: {e}")
+                logger.error("Error disconnecting player %s: %s", self.player_id, e)
 
 
 class GameAPI:
@@ -121,6 +97,8 @@ class GameAPI:
     buzzers_locked: bool
     is_active: bool
     countdown_active: bool
+    _game_info_cache: tuple[float, str, str, dict[str, Any]] | None
+    _http: requests.Session
 
     def __init__(self, server_url: str = "http://localhost:3001") -> None:
         self.server_url = server_url
@@ -128,6 +106,13 @@ class GameAPI:
         self.player_connections = {}
         self.player_mappings = {}
         self.game_update_callback = None
+        self._game_info_cache = None
+
+        self._http = requests.Session()
+        self._http.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
 
         self.buzzers_locked = False
         self.is_active = False
@@ -154,28 +139,69 @@ class GameAPI:
         else:
             return "Buzzers ready"
 
+    def handle_game_update(self, data: dict[str, Any]) -> None:
+        """Handle game state updates including all state changes"""
+        try:
+            if "data" in data and "game" in data["data"]:
+                game_data = data["data"]["game"]
+
+                locked = game_data.get("buzzersLocked", False)
+                active = game_data.get("isActive", False)
+                countdown = game_data.get("countdownActive", False)
+
+                if (locked, active, countdown) != (
+                    self.buzzers_locked,
+                    self.is_active,
+                    self.countdown_active,
+                ):
+                    if locked != self.buzzers_locked:
+                        status = "LOCKED" if locked else "UNLOCKED"
+                        logger.info("Buzzers are now %s", status)
+
+                    if active != self.is_active:
+                        status = "ACTIVE" if active else "INACTIVE"
+                        logger.info("Game is now %s", status)
+
+                    if countdown != self.countdown_active:
+                        status = "COUNTDOWN" if countdown else "NO COUNTDOWN"
+                        logger.info("Countdown state: %s", status)
+
+                    self.buzzers_locked = locked
+                    self.is_active = active
+                    self.countdown_active = countdown
+
+                if self.game_update_callback:
+                    self.game_update_callback(data)
+        except Exception as e:
+            logger.error("Error processing game update: %s", e)
+
     def connect_to_server(self) -> bool:
         """This method is kept for compatibility but doesn't do anything"""
         return True
 
     def disconnect_from_server(self) -> None:
         """Disconnect all players from the game server"""
-        for connection in self.player_connections.values():
-            connection.disconnect_from_server()
-        self.player_connections.clear()
+        connections = list(self.player_connections.values())
+        self.player_connections = {}
+        if not connections:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(8, len(connections))) as executor:
+            for connection in connections:
+                executor.submit(connection.disconnect_from_server)
 
     def join_game(self, game_code: str, player_name: str) -> dict[str, any] | None:
         """Join an existing game and return player info"""
-        print(f"join_game called: code={game_code}, name={player_name}")
+        logger.debug("join_game called: code=%s, name=%s", game_code, player_name)
 
         try:
-            print(f"Making API request to {self.server_url}/api/games/join")
-            response = requests.post(
+            logger.debug("Making API request to %s/api/games/join", self.server_url)
+            response = self._http.post(
                 f"{self.server_url}/api/games/join",
                 json={"gameCode": game_code, "playerName": player_name},
             )
 
-            print(f"📡 API response status: {response.status_code}")
+            logger.debug("API response status: %s", response.status_code)
 
             if response.status_code == 200:
                 data = response.json()
@@ -192,48 +218,67 @@ class GameAPI:
                 }
             else:
                 error_msg = response.json().get("error", "Unknown error")
-                print(f"API request failed: {error_msg}")
+                logger.warning("API request failed: %s", error_msg)
                 return None
 
         except Exception as e:
-            print(f"Exception in join_game for {player_name}: {e}")
+            logger.error("Exception in join_game for %s: %s", player_name, e)
             return None
 
     def press_buzzer(self, local_player_id: str) -> bool:
         """Press buzzer for a specific player using their local ID"""
         if not self.is_active or self.buzzers_locked or self.countdown_active:
             if self.countdown_active:
-                print(f"[BUZZER] Press ignored: countdown in progress")
+                logger.debug("Press ignored: countdown in progress")
             elif not self.is_active:
-                print(f"[BUZZER] Press ignored: round not active")
+                logger.debug("Press ignored: round not active")
             elif self.buzzers_locked:
-                print(f"[BUZZER] Press ignored: buzzers are locked")
+                logger.debug("Press ignored: buzzers are locked")
             return False
 
         connection = self.player_connections.get(local_player_id)
         if not connection:
-            print(f"No connection found for local player {local_player_id}")
+            logger.warning("No connection found for local player %s", local_player_id)
             return False
 
         return connection.press_buzzer()
 
+    def clear_buzzers(self) -> bool:
+        """Ask the server to clear all buzzer presses for the current game"""
+        connection = next(
+            (conn for conn in self.player_connections.values() if conn.connected), None
+        )
+        if not connection:
+            logger.warning("Cannot clear buzzers: no player connections available")
+            return False
+
+        try:
+            connection.sio.emit("game_action", {"type": "clear_buzzers", "data": {}})
+            return True
+        except Exception as e:
+            logger.error("Failed to clear buzzers: %s", e)
+            return False
+
     def register_player_mapping(self, local_player_id: str, api_player_id: str) -> None:
         """Register a mapping between local player ID and API player ID"""
 
         self.player_mappings[local_player_id] = api_player_id
-        print(f"Mapped local player {local_player_id} to API player {api_player_id}")
+        logger.debug(
+            "Mapped local player %s to API player %s", local_player_id, api_player_id
+        )
 
         if self.game_id:
-            print(f"Game ID available: {self.game_id}")
-            print(
-                f"Creating socket connection for player {api_player_id} to {self.server_url}"
+            logger.debug(
+                "Creating socket connection for player %s to %s in game %s",
+                api_player_id,
+                self.server_url,
+                self.game_id,
             )
 
             try:
                 connection = PlayerConnection(
                     self.server_url, api_player_id, self.game_id, self
                 )
-                print(f"PlayerConnection object created for {api_player_id}")
 
                 max_retries = 3
                 for attempt in range(max_retries):
@@ -242,12 +287,39 @@ class GameAPI:
                         return
                     else:
                         if attempt < max_retries - 1:
-                            time.sleep(1)
+                            time.sleep(0.1 * (3**attempt))
 
             except Exception as e:
-                print(f"Error creating PlayerConnection for {api_player_id}: {e}")
+                logger.error(
+                    "Error creating PlayerConnection for %s: %s", api_player_id, e
+                )
         else:
-            print("Cannot register player mapping: game ID is not set")
+            logger.warning("Cannot register player mapping: game ID is not set")
+
+    def connect_all(
+        self, game_code: str, player_names: dict[str, str]
+    ) -> dict[str, str | None]:
+        """Join and connect several players concurrently, keyed by local player ID"""
+        if not player_names:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(8, len(player_names))) as executor:
+            api_player_ids = executor.map(
+                lambda item: self._join_and_connect(game_code, *item),
+                player_names.items(),
+            )
+            return dict(zip(player_names, api_player_ids))
+
+    def _join_and_connect(
+        self, game_code: str, local_player_id: str, player_name: str
+    ) -> str | None:
+        """Join the game with one player and open its socket, returning the API player ID"""
+        result = self.join_game(game_code, player_name)
+        if not result:
+            return None
+
+        self.register_player_mapping(local_player_id, result["playerId"])
+        return result["playerId"]
 
     def get_registered_players(self) -> dict[str, str]:
         """Get all registered player mappings"""
@@ -264,11 +336,23 @@ class GameAPI:
         if not self.game_id:
             return None
 
+        now = time.monotonic()
+        if self._game_info_cache:
+            fetched_at, server_url, game_id, game = self._game_info_cache
+            if (
+                server_url == self.server_url
+                and game_id == self.game_id
+                and now - fetched_at < GAME_INFO_TTL
+            ):
+                return game
+
         try:
-            response = requests.get(f"{self.server_url}/api/games/{self.game_id}")
+            response = self._http.get(f"{self.server_url}/api/games/{self.game_id}")
             if response.status_code == 200:
-                return response.json()["game"]
+                game = response.json()["game"]
+                self._game_info_cache = (now, self.server_url, self.game_id, game)
+                return game
             return None
         except Exception as e:
-            print(f"Error getting game info: {e}")
+            logger.error("Error getting game info: %s", e)
             return None
@@ -1,4 +1,6 @@
+import time
 from collections.abc import Callable
+from functools import lru_cache
 
 try:
     import RPi.GPIO as GPIO
@@ -7,7 +9,9 @@ try:
 except ImportError:
     GPIO = None
     MOCK_MODE = True
-    print("⚠️  RPi.GPIO not available - running in mock mode")
+
+# How long to let the contact settle after an edge before confirming the pin is low
+SETTLE_SECONDS = 0.01
 
 
 class GPIOHandler:
@@ -15,35 +19,76 @@ class GPIOHandler:
         self.mock_mode = MOCK_MODE
         self.callbacks: dict[int, Callable[[int], None]] = {}
         self.mock_states: dict[int, bool] = {}
+        # Mock presses look callbacks up by BCM pin number (0-27)
+        self.mock_callbacks: list[Callable[[int], None] | None] = [None] * 28
 
-        if GPIO is not None:
+        if self.mock_mode:
+            print("⚠️  RPi.GPIO not available - running in mock mode")
+        elif GPIO is not None:
             GPIO.setmode(GPIO.BCM)
             GPIO.setwarnings(False)
 
     def setup_button(self, pin: int, callback: Callable[[int], None]) -> None:
         """Setup a button on the specified GPIO pin with a callback function"""
         if self.mock_mode:
+            if not self._has_mock_slot(pin):
+                print(f"Mock: Invalid pin {pin}, button not set up")
+                return
             self.mock_states[pin] = False
-            self.callbacks[pin] = callback
+            self.mock_callbacks[pin] = callback
             print(f"Mock: Button setup on pin {pin}")
         elif GPIO is not None:
+            self.callbacks[pin] = callback
             GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
             GPIO.add_event_detect(
-                pin, GPIO.FALLING, callback=lambda pin: callback(pin), bouncetime=300
+                pin, GPIO.FALLING, callback=self._on_edge, bouncetime=50
             )
 
+    def _on_edge(self, pin: int) -> None:
+        """Forward a falling edge if the pin still reads low after settling"""
+        # bouncetime already drops rapid repeats, this only rejects short glitches
+        time.sleep(SETTLE_SECONDS)
+        if GPIO.input(pin) != GPIO.LOW:
+            return
+
+        callback = self.callbacks.get(pin)
+        if callback:
+            callback(pin)
+
+    def teardown_button(self, pin: int) -> None:
+        """Stop watching a single button and release its GPIO pin"""
+        self.callbacks.pop(pin, None)
+        if self.mock_mode:
+            self.mock_states.pop(pin, None)
+            if self._has_mock_slot(pin):
+                self.mock_callbacks[pin] = None
+            print(f"Mock: Button removed from pin {pin}")
+        elif GPIO is not None:
+            GPIO.remove_event_detect(pin)
+            GPIO.cleanup(pin)
+
     def cleanup(self) -> None:
         """Cleanup GPIO resources"""
         if GPIO is not None:
             GPIO.cleanup()
 
+    def _has_mock_slot(self, pin: int) -> bool:
+        """Check that a pin fits in the mock callback table"""
+        return 0 <= pin < len(self.mock_callbacks)
+
     def mock_button_press(self, pin: int) -> None:
         """Mock a button press for testing purposes"""
-        if self.mock_mode and pin in self.callbacks:
-            print(f"Mock: Button {pin} pressed!")
-            self.callbacks[pin](pin)
+        if self.mock_mode:
+            if self._has_mock_slot(pin):
+                callback = self.mock_callbacks[pin]
+                if callback:
+                    print(f"Mock: Button {pin} pressed!")
+                    callback(pin)
         elif GPIO is not None:
             print("Mock button press only available in mock mode")
 
 
-gpio_handler = GPIOHandler()
+@lru_cache(maxsize=1)
+def get_gpio_handler() -> GPIOHandler:
+    """Get the process-wide GPIO handler, set up on first use"""
+    return GPIOHandler()
@@ -1,62 +1,232 @@
+import atexit
+import errno
+import itertools
 import json
 import os
-from typing import NamedTuple
+import threading
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from types import MappingProxyType
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class PlayerConfig(NamedTuple):
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# BCM GPIO pins usable for buttons on the 40-pin header
+_COMMON_PINS: tuple[int, ...] = tuple(range(2, 28))
+_VALID_PIN_MASK: int = sum(1 << pin for pin in _COMMON_PINS)
+
+# Mutations within this many seconds of each other are written to disk together
+_SAVE_DELAY = 1.0
+
+# Config files above this size are streamed with ijson when it is installed
+_STREAM_THRESHOLD = 64 * 1024
+
+
+@dataclass(slots=True, frozen=True)
+class PlayerConfig:
     name: str
     gpio_pin: int
     enabled: bool = True
 
 
+# Parsed config files keyed by (path, mtime_ns, size) so unchanged files skip parsing
+_CONFIG_CACHE: dict[tuple[str, int, int], dict[str, PlayerConfig]] = {}
+
+
+def _forget_cached_config(path: str) -> None:
+    """Drop every cached parse of a config file"""
+    for key in [key for key in _CONFIG_CACHE if key[0] == path]:
+        del _CONFIG_CACHE[key]
+
+
+def _is_valid_pin(gpio_pin: int) -> bool:
+    """Check a pin against the usable BCM pins with a single bitmask test"""
+    return gpio_pin >= 0 and (_VALID_PIN_MASK >> gpio_pin) & 1 == 1
+
+
+def _write_synced(path: str, payload: bytes) -> None:
+    """Write bytes to a file and make sure they reached the disk"""
+    with open(path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_config(path: str, size: int) -> dict[str, PlayerConfig]:
+    """Parse a config file into player configurations"""
+    if ijson is not None and size > _STREAM_THRESHOLD:
+        with open(path, "rb") as f:
+            return {
+                player_id: PlayerConfig(**config)
+                for player_id, config in ijson.kvitems(f, "")
+            }
+
+    with open(path, "rb") as f:
+        data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+    return {player_id: PlayerConfig(**config) for player_id, config in data.items()}
+
+
 class PlayerManager:
     def __init__(self, config_file: str = "player_config.json") -> None:
         self.config_file: str = config_file
         self.players: dict[str, PlayerConfig] = {}
+        self._players_view: Mapping[str, PlayerConfig] = MappingProxyType(self.players)
+        self._enabled_players: dict[str, PlayerConfig] | None = None
+        self._pin_index: dict[int, str] = {}
+        # next() on a count is atomic, so concurrent sessions never share an ID
+        self._id_counter: Iterator[int] = itertools.count(1)
+        self._dirty: bool = False
+        self._defer: int = 0
+        self._last_saved_payload: bytes | None = None
+        self._save_lock = threading.Lock()
+        self._save_timer: threading.Timer | None = None
+        self.player_change_callback: (
+            Callable[[str, PlayerConfig | None], None] | None
+        ) = None
         self.load_config()
+        atexit.register(self.flush)
 
     def load_config(self) -> None:
         """Load player configuration from JSON file"""
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file) as f:
-                    data = json.load(f)
-                    self.players = {
-                        player_id: PlayerConfig(**config)
-                        for player_id, config in data.items()
-                    }
-            except Exception as e:
-                print(f"Error loading config: {e}")
-                self.players = {}
-        else:
+        self._enabled_players = None
+        self._last_saved_payload = None
+        try:
+            stat = os.stat(self.config_file)
+            key = (self.config_file, stat.st_mtime_ns, stat.st_size)
+            cached = _CONFIG_CACHE.get(key)
+            if cached is None:
+                cached = _read_config(self.config_file, stat.st_size)
+                _forget_cached_config(self.config_file)
+                _CONFIG_CACHE[key] = cached
+            # Copy so our mutations never leak into the shared cache
+            self.players = dict(cached)
+        except FileNotFoundError:
+            self.players = {}
+        except Exception as e:
+            print(f"Error loading config: {e}")
             self.players = {}
 
+        self._players_view = MappingProxyType(self.players)
+        self._pin_index = {
+            config.gpio_pin: player_id for player_id, config in self.players.items()
+        }
+
     def save_config(self) -> None:
         """Save player configuration to JSON file"""
+        # Cleared before the snapshot so a mutation during the write is saved later
+        self._dirty = False
         try:
+            # Snapshot first, this may run on the flush timer thread
             data = {
-                player_id: config._asdict()
-                for player_id, config in self.players.items()
+                player_id: {
+                    "name": config.name,
+                    "gpio_pin": config.gpio_pin,
+                    "enabled": config.enabled,
+                }
+                for player_id, config in self.players.copy().items()
             }
-            with open(self.config_file, "w") as f:
-                json.dump(data, f, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, indent=2).encode()
+
+            # Skip the write entirely when nothing changed since the last save
+            if payload == self._last_saved_payload:
+                return
+
+            # Write aside and swap in so a crash never leaves a truncated file
+            tmp_file = self.config_file + ".tmp"
+            _write_synced(tmp_file, payload)
+            try:
+                os.replace(tmp_file, self.config_file)
+            except OSError as e:
+                # A bind-mounted config file (docker-compose.yml) cannot be renamed over
+                if e.errno not in (errno.EBUSY, errno.EXDEV):
+                    raise
+                os.remove(tmp_file)
+                _write_synced(self.config_file, payload)
+            _forget_cached_config(self.config_file)
+            self._last_saved_payload = payload
         except Exception as e:
+            # Keep the changes pending so the next flush or exit retries them
+            self._dirty = True
             print(f"Error saving config: {e}")
 
+    def flush(self) -> None:
+        """Write pending changes to disk now instead of waiting for the timer"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self.save_config()
+
+    def _maybe_save(self) -> None:
+        """Mark the config as changed and schedule a save unless a batch is open"""
+        self._dirty = True
+        if self._defer > 0:
+            return
+
+        # Restart the countdown so a burst of mutations ends in a single write
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(_SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group several mutations into a single config save"""
+        self._defer += 1
+        try:
+            yield
+        finally:
+            self._defer -= 1
+            if self._defer == 0:
+                self.flush()
+
+    def new_id(self) -> str:
+        """Allocate a short player ID not used by any configured player"""
+        while True:
+            player_id = f"p{next(self._id_counter):04x}"
+            if player_id not in self.players:
+                return player_id
+
     def add_player(self, player_id: str, name: str, gpio_pin: int) -> bool:
         """Add a new player configuration"""
+        if not _is_valid_pin(gpio_pin):
+            return False
         if self.is_gpio_pin_used(gpio_pin, exclude_player=player_id):
             return False
 
+        previous = self.players.get(player_id)
+        if previous is not None:
+            self._pin_index.pop(previous.gpio_pin, None)
+
         self.players[player_id] = PlayerConfig(name=name, gpio_pin=gpio_pin)
-        self.save_config()
+        self._pin_index[gpio_pin] = player_id
+        self._enabled_players = None
+        self._maybe_save()
+        self._notify_change(player_id)
         return True
 
     def remove_player(self, player_id: str) -> bool:
         """Remove a player configuration"""
         if player_id in self.players:
-            del self.players[player_id]
-            self.save_config()
+            config = self.players.pop(player_id)
+            self._pin_index.pop(config.gpio_pin, None)
+            self._enabled_players = None
+            self._maybe_save()
+            self._notify_change(player_id)
             return True
         return False
 
@@ -68,77 +238,67 @@ class PlayerManager:
         enabled: bool | None = None,
     ) -> bool:
         """Update player configuration"""
-        if player_id not in self.players:
+        current = self.players.get(player_id)
+        if current is None:
             return False
 
-        current = self.players[player_id]
-
+        updates: dict[str, str | int | bool] = {}
+        if name is not None:
+            updates["name"] = name
         if gpio_pin is not None and gpio_pin != current.gpio_pin:
+            if not _is_valid_pin(gpio_pin):
+                return False
             if self.is_gpio_pin_used(gpio_pin, exclude_player=player_id):
                 return False
+            updates["gpio_pin"] = gpio_pin
+        if enabled is not None:
+            updates["enabled"] = enabled
 
-        self.players[player_id] = PlayerConfig(
-            name=name if name is not None else current.name,
-            gpio_pin=gpio_pin if gpio_pin is not None else current.gpio_pin,
-            enabled=enabled if enabled is not None else current.enabled,
-        )
-        self.save_config()
+        self.players[player_id] = replace(current, **updates)
+        if "gpio_pin" in updates:
+            self._pin_index.pop(current.gpio_pin, None)
+            self._pin_index[gpio_pin] = player_id
+        self._enabled_players = None
+        self._maybe_save()
+        self._notify_change(player_id)
         return True
 
+    def set_player_change_callback(
+        self, callback: Callable[[str, PlayerConfig | None], None]
+    ) -> None:
+        """Set callback for player additions, updates and removals"""
+        self.player_change_callback = callback
+
+    def _notify_change(self, player_id: str) -> None:
+        """Report a player change, passing None as config when it was removed"""
+        if self.player_change_callback:
+            self.player_change_callback(player_id, self.players.get(player_id))
+
     def get_player(self, player_id: str) -> PlayerConfig | None:
         """Get player configuration"""
         return self.players.get(player_id)
 
-    def get_all_players(self) -> dict[str, PlayerConfig]:
-        """Get all player configurations"""
-        return self.players.copy()
+    def get_all_players(self) -> Mapping[str, PlayerConfig]:
+        """Get a live read-only view of all players, not a snapshot"""
+        return self._players_view
 
-    def get_enabled_players(self) -> dict[str, PlayerConfig]:
+    def get_enabled_players(self) -> Mapping[str, PlayerConfig]:
         """Get only enabled player configurations"""
-        return {
-            player_id: config
-            for player_id, config in self.players.items()
-            if config.enabled
-        }
+        if self._enabled_players is None:
+            self._enabled_players = {
+                player_id: config
+                for player_id, config in self.players.items()
+                if config.enabled
+            }
+        return self._enabled_players
 
     def is_gpio_pin_used(
         self, gpio_pin: int, exclude_player: str | None = None
     ) -> bool:
         """Check if a GPIO pin is already in use"""
-        return any(
-            player_id != exclude_player and config.gpio_pin == gpio_pin
-            for player_id, config in self.players.items()
-        )
+        owner = self._pin_index.get(gpio_pin)
+        return owner is not None and owner != exclude_player
 
     def get_available_gpio_pins(self) -> list[int]:
         """Get list of commonly used GPIO pins that are available"""
-        common_pins = [
-            2,
-            3,
-            4,
-            5,
-            6,
-            7,
-            8,
-            9,
-            10,
-            11,
-            12,
-            13,
-            14,
-            15,
-            16,
-            17,
-            18,
-            19,
-            20,
-            21,
-            22,
-            23,
-            24,
-            25,
-            26,
-            27,
-        ]
-        used_pins = {config.gpio_pin for config in self.players.values()}
-        return [pin for pin in common_pins if pin not in used_pins]
+        return [pin for pin in _COMMON_PINS if pin not in self._pin_index]
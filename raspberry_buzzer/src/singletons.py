@@ -0,0 +1,45 @@
+import threading
+from collections.abc import Callable
+from functools import lru_cache, wraps
+from typing import TypeVar
+
+from .buzzer_monitor import BuzzerMonitor
+from .game_api import GameAPI
+from .player_manager import PlayerManager
+
+T = TypeVar("T")
+
+# Reentrant because buzzer_monitor() builds the other singletons while holding it
+_lock = threading.RLock()
+
+
+def _singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """Cache a factory's result, building it once even when threads race"""
+    cached = lru_cache(maxsize=1)(factory)
+
+    @wraps(factory)
+    def get() -> T:
+        with _lock:
+            return cached()
+
+    return get
+
+
+@_singleton
+def player_manager() -> PlayerManager:
+    """Get the process-wide player manager"""
+    return PlayerManager()
+
+
+@_singleton
+def game_api() -> GameAPI:
+    """Get the process-wide game API client"""
+    return GameAPI()
+
+
+@_singleton
+def buzzer_monitor() -> BuzzerMonitor:
+    """Get the process-wide buzzer monitor, wired to the shared API and players"""
+    monitor = BuzzerMonitor(game_api(), player_manager())
+    player_manager().set_player_change_callback(monitor.sync_player)
+    return monitor